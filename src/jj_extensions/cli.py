@@ -1,3 +1,4 @@
+import logging
 import sys
 import subprocess
 from typing import Optional
@@ -13,11 +14,18 @@ from .sync import sync_stack
     "--repo",
     type=click.Path(file_okay=False, dir_okay=True),
     default=".",
-    help="TEST Path to repo (default: .)",
+    help="Path to repo (default: .)",
 )
+@click.option("-v", "--verbose", is_flag=True, help="Show debug output")
 @click.pass_context
-def main(ctx: click.Context, repo: str) -> None:
-    print("main")
+def main(ctx: click.Context, repo: str, verbose: bool) -> None:
+    # Configure only our own logger; the root logger stays at WARNING so
+    # httpx's per-request INFO lines (and asyncio debug) are not shown.
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log = logging.getLogger("jj_extensions")
+    log.addHandler(handler)
+    log.setLevel(logging.DEBUG if verbose else logging.INFO)
     ctx.ensure_object(dict)
     ctx.obj["repo"] = repo
 
@@ -47,7 +55,6 @@ def stack_sync(
     marker: str,
     dry_run: bool,
 ) -> None:
-    print("stack_sync")
     repo = ctx.obj["repo"]
     try:
         sync_stack(
@@ -66,5 +73,4 @@ def stack_sync(
 
 
 if __name__ == "__main__":
-    print("main")
     main()
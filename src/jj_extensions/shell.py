@@ -1,12 +1,33 @@
 import json
+import shutil
 import subprocess
-from typing import List, Optional, Any
+import tempfile
+from typing import Iterator, List, Optional, Any
+
+
+try:
+    # Optional speedup; orjson.JSONDecodeError subclasses json.JSONDecodeError.
+    from orjson import loads as loads_json
+except ImportError:
+    from json import loads as loads_json
+
+
+# Absolute paths of the tools we call, resolved once instead of per spawn.
+_BIN = {name: shutil.which(name) or name for name in ("gh", "jj", "git")}
+
+
+def _resolve(args: List[str]) -> List[str]:
+    if args and args[0] in _BIN:
+        return [_BIN[args[0]], *args[1:]]
+    return args
 
 
 def run(
     args: List[str], cwd: Optional[str] = None, check: bool = True
 ) -> subprocess.CompletedProcess:
-    return subprocess.run(args, cwd=cwd, text=True, capture_output=True, check=check)
+    return subprocess.run(
+        _resolve(args), cwd=cwd, text=True, capture_output=True, check=check
+    )
 
 
 def run_ok(args: List[str], cwd: Optional[str] = None) -> str:
@@ -17,8 +38,29 @@ def run_ok(args: List[str], cwd: Optional[str] = None) -> str:
 def capture_json(args: List[str], cwd: Optional[str] = None) -> Any:
     out = run_ok(args, cwd=cwd)
     try:
-        return json.loads(out)
+        return loads_json(out)
     except json.JSONDecodeError as exc:
         raise RuntimeError(
             f"Failed to parse JSON from: {' '.join(args)}\nOutput: {out}"
         ) from exc
+
+
+def iter_lines(args: List[str], cwd: Optional[str] = None) -> Iterator[str]:
+    """Yield stripped stdout lines as the command produces them."""
+    # stderr goes to a file rather than a pipe: a child filling an unread
+    # stderr pipe would block while we wait on stdout.
+    with tempfile.TemporaryFile(mode="w+") as err, subprocess.Popen(
+        _resolve(args),
+        cwd=cwd,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=err,
+    ) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            yield line.strip()
+        if proc.wait() != 0:
+            err.seek(0)
+            raise subprocess.CalledProcessError(
+                proc.returncode, args, stderr=err.read()
+            )
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from ._gh import GitHubClient, _gather_bounded, get_default_branch
+from ._jj import discover_stack, push_stack
+from ._marker import render_stack_sections, upsert_marker_section
+from ._types import BranchInfo, PullRequest, PullRequestUpdate
+
+__all__ = [
+    "BranchInfo",
+    "GitHubClient",
+    "PullRequest",
+    "PullRequestUpdate",
+    "discover_stack",
+    "get_default_branch",
+    "push_stack",
+    "render_stack_sections",
+    "sync_stack",
+    "upsert_marker_section",
+]
+
+
+log = logging.getLogger(__name__)
+
+
+def sync_stack(
+    repo_path: str,
+    remote: str = "origin",
+    default_base: Optional[str] = None,
+    marker_key: str = "jj-stack-sync",
+    dry_run: bool = False,
+) -> None:
+    asyncio.run(
+        _sync_stack(
+            repo_path=repo_path,
+            remote=remote,
+            default_base=default_base,
+            marker_key=marker_key,
+            dry_run=dry_run,
+        )
+    )
+
+
+async def _sync_stack(
+    repo_path: str,
+    remote: str,
+    default_base: Optional[str],
+    marker_key: str,
+    dry_run: bool,
+) -> None:
+    stack = discover_stack(repo_path)
+    branches = [branch.name for branch in stack]
+    if not branches:
+        push_stack(repo_path, stack)
+        return
+    log.debug("Stack: %s", branches)
+
+    # The push, default branch lookup and gh credential reads are independent
+    # blocking subprocess calls, so overlap them.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        pushed = pool.submit(push_stack, repo_path, stack)
+        detected_base = (
+            pool.submit(get_default_branch, repo_path) if not default_base else None
+        )
+        gh = pool.submit(GitHubClient.from_gh, repo_path).result()
+
+    async with gh:
+        pushed.result()
+        base_default = default_base or detected_base.result()
+        log.debug("Default base: %s", base_default)
+
+        head_to_pr = await gh.list_open_prs_by_head()
+        log.debug("Open PRs: %d", len(head_to_pr))
+        # Only the stack's PRs need their bodies.
+        stack_prs = [head_to_pr[name] for name in branches if name in head_to_pr]
+        for pr in await gh.with_bodies(stack_prs):
+            head_to_pr[pr.head] = pr
+
+        bases = [base_default] + branches[:-1]
+
+        # Bases only need to exist on the remote (pushed above), not as PRs, so
+        # missing PRs can be created concurrently.
+        missing = [
+            (branch_name, base)
+            for branch_name, base in zip(branches, bases)
+            if branch_name not in head_to_pr
+        ]
+        if missing and not dry_run:
+            for branch_name, base in missing:
+                log.info("Creating PR for %s to %s", branch_name, base)
+            created = await _gather_bounded(
+                gh.create_pr(head=branch_name, base=base, title=branch_name, body="")
+                for branch_name, base in missing
+            )
+            for pr in created:
+                log.info("PR created: #%d", pr.number)
+                head_to_pr[pr.head] = pr
+
+        pr_numbers_in_order: List[int] = [
+            head_to_pr[branch_name].number if branch_name in head_to_pr else 0
+            for branch_name in branches
+        ]
+
+        # Collect every edit first; they are sent together in one mutation.
+        # PRs created above already have the right base, so only drifted
+        # bases and changed bodies end up here.
+        updates: Dict[str, List[Optional[str]]] = {}
+        for branch_name, base in zip(branches, bases):
+            pr = head_to_pr.get(branch_name)
+            if pr and pr.base != base:
+                log.info("Updating PR base for %s to %s", branch_name, base)
+                updates.setdefault(pr.id, [None, None])[0] = base
+
+        sections = render_stack_sections(marker_key, pr_numbers_in_order)
+        for branch_name, section in zip(branches, sections):
+            pr = head_to_pr.get(branch_name)
+            log.debug("pr: %s", pr)
+            if not pr:
+                continue
+            log.debug("section: %s", section)
+            new_body = upsert_marker_section(pr.body or "", marker_key, section)
+            log.debug("new_body: %s", new_body)
+            if new_body.strip() == (pr.body or "").strip():
+                continue
+            log.info("Updating PR body for %s", branch_name)
+            updates.setdefault(pr.id, [None, None])[1] = new_body
+
+        if updates and not dry_run:
+            await gh.update_prs(
+                [(node_id, base, body) for node_id, (base, body) in updates.items()]
+            )
+
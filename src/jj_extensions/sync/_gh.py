@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..shell import loads_json, run_ok
+from ._types import PullRequest, PullRequestUpdate
+
+
+T = TypeVar("T")
+
+# Seconds a detected default branch is reused from the on-disk cache.
+DEFAULT_BRANCH_CACHE_TTL = 3600
+
+GITHUB_HOST = "github.com"
+GITHUB_API_URL = "https://api.github.com"
+
+LIST_OPEN_PRS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: OPEN, first: 100, after: $cursor) {
+      nodes { id number headRefName baseRefName }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+# Upper bound on concurrent GitHub API calls, to stay clear of rate limits.
+GH_MAX_CONCURRENCY = 8
+
+
+def _default_branch_cache_file(repo_path: str) -> str:
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    digest = hashlib.blake2b(
+        os.path.realpath(repo_path).encode(), digest_size=8
+    ).hexdigest()
+    return os.path.join(cache_root, "jj-extensions", "default_branch", f"{digest}.json")
+
+
+def _read_cached_default_branch(cache_file: str) -> Optional[str]:
+    try:
+        if time.time() - os.path.getmtime(cache_file) > DEFAULT_BRANCH_CACHE_TTL:
+            return None
+        with open(cache_file) as f:
+            return json.load(f).get("name") or None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_cached_default_branch(cache_file: str, name: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"name": name}, f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # caching is best-effort
+
+
+def _lookup_default_branch(repo_path: str) -> Optional[str]:
+    try:
+        # Use gh if available
+        from ..shell import (
+            capture_json,
+        )  # local import to avoid unused when gh not present
+
+        data = capture_json(
+            ["gh", "repo", "view", "--json", "defaultBranchRef"], cwd=repo_path
+        )
+        default_ref = data.get("defaultBranchRef", {})
+        name = default_ref.get("name")
+        if name:
+            return name
+    except Exception:
+        pass
+    try:
+        ref = run_ok(["git", "symbolic-ref", "refs/remotes/origin/HEAD"], cwd=repo_path)
+        return ref.rsplit("/", 1)[-1]
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=32)
+def get_default_branch(repo_path: str) -> str:
+    cache_file = _default_branch_cache_file(repo_path)
+    name = _read_cached_default_branch(cache_file)
+    if name:
+        return name
+    name = _lookup_default_branch(repo_path)
+    if not name:
+        # Don't persist the guess; retry detection next time.
+        return "main"
+    _write_cached_default_branch(cache_file, name)
+    return name
+
+
+def _graphql_string(value: str) -> str:
+    # JSON string escapes are valid GraphQL escapes; keep non-ASCII as-is so
+    # emoji do not turn into surrogate-pair escapes.
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _raise_for_status(resp: httpx.Response) -> None:
+    if resp.is_error:
+        raise RuntimeError(
+            f"GitHub API {resp.request.method} {resp.request.url.path} failed "
+            f"({resp.status_code}): {resp.text}"
+        )
+
+
+def _api_urls(host: str) -> Tuple[str, str]:
+    """Return the (REST base, GraphQL endpoint) URLs for a GitHub host."""
+    if host == GITHUB_HOST:
+        return GITHUB_API_URL, f"{GITHUB_API_URL}/graphql"
+    # GitHub Enterprise Server
+    return f"https://{host}/api/v3", f"https://{host}/api/graphql"
+
+
+def _pull_request_from_rest(pr: Dict[str, Any]) -> PullRequest:
+    return PullRequest(
+        number=int(pr["number"]),
+        head=pr["head"]["ref"],
+        base=pr["base"]["ref"],
+        body=pr.get("body") or "",
+        id=pr.get("node_id", ""),
+    )
+
+
+class GitHubClient:
+    """Async GitHub API client reusing the gh CLI's credentials.
+
+    gh is only spawned twice, to read the repository and the token for its
+    host; every API call afterwards shares one HTTP/2 connection.
+    """
+
+    def __init__(
+        self, token: str, name_with_owner: str, host: str = GITHUB_HOST
+    ) -> None:
+        self.name_with_owner = name_with_owner
+        rest_url, self._graphql_url = _api_urls(host)
+        self._client = httpx.AsyncClient(
+            base_url=rest_url,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+            },
+            http2=True,
+            limits=httpx.Limits(max_connections=16),
+        )
+
+    @classmethod
+    def from_gh(cls, repo_path: str) -> "GitHubClient":
+        from ..shell import capture_json
+
+        data = capture_json(
+            ["gh", "repo", "view", "--json", "nameWithOwner,url"], cwd=repo_path
+        )
+        host = urlsplit(data["url"]).hostname or GITHUB_HOST
+        token = run_ok(["gh", "auth", "token", "--hostname", host], cwd=repo_path)
+        return cls(token, data["nameWithOwner"], host=host)
+
+    async def __aenter__(self) -> "GitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._client.aclose()
+
+    async def list_open_prs_by_head(self) -> Dict[str, PullRequest]:
+        """List open PRs keyed by head branch, without their bodies.
+
+        Bodies can be large and most open PRs are not part of the stack;
+        use :meth:`with_bodies` for the ones that are needed.
+        """
+        owner, name = self.name_with_owner.split("/", 1)
+        result: Dict[str, PullRequest] = {}
+        cursor: Optional[str] = None
+        while True:
+            data = await self.graphql(
+                LIST_OPEN_PRS_QUERY,
+                variables={"owner": owner, "name": name, "cursor": cursor},
+            )
+            page = data["repository"]["pullRequests"]
+            for pr in page["nodes"]:
+                result[pr["headRefName"]] = PullRequest(
+                    number=int(pr["number"]),
+                    head=pr["headRefName"],
+                    base=pr["baseRefName"],
+                    body="",
+                    id=pr["id"],
+                )
+            if not page["pageInfo"]["hasNextPage"]:
+                return result
+            cursor = page["pageInfo"]["endCursor"]
+
+    async def with_bodies(self, prs: List[PullRequest]) -> List[PullRequest]:
+        """Return copies of ``prs`` with bodies filled in, using one query."""
+        if not prs:
+            return []
+        owner, name = self.name_with_owner.split("/", 1)
+        lookups = "\n".join(
+            f"    p{i}: pullRequest(number: {pr.number}) {{ body }}"
+            for i, pr in enumerate(prs)
+        )
+        data = await self.graphql(
+            "query($owner: String!, $name: String!) {\n"
+            "  repository(owner: $owner, name: $name) {\n"
+            f"{lookups}\n"
+            "  }\n"
+            "}",
+            variables={"owner": owner, "name": name},
+        )
+        repo = data["repository"]
+        return [
+            dataclasses.replace(pr, body=repo[f"p{i}"]["body"] or "")
+            for i, pr in enumerate(prs)
+        ]
+
+    async def create_pr(
+        self, head: str, base: str, title: str, body: str
+    ) -> PullRequest:
+        resp = await self._client.post(
+            f"/repos/{self.name_with_owner}/pulls",
+            json={"head": head, "base": base, "title": title, "body": body},
+        )
+        _raise_for_status(resp)
+        return _pull_request_from_rest(loads_json(resp.content))
+
+    async def graphql(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        resp = await self._client.post(
+            self._graphql_url, json={"query": query, "variables": variables or {}}
+        )
+        _raise_for_status(resp)
+        data = loads_json(resp.content)
+        if data.get("errors"):
+            raise RuntimeError(f"GraphQL request failed: {data['errors']}")
+        return data.get("data") or {}
+
+    async def update_prs(self, updates: List[PullRequestUpdate]) -> None:
+        """Apply all base/body edits with a single GraphQL mutation."""
+        if not updates:
+            return
+        mutations: List[str] = []
+        for i, (node_id, base, body) in enumerate(updates):
+            fields = [f"pullRequestId: {_graphql_string(node_id)}"]
+            if base:
+                fields.append(f"baseRefName: {_graphql_string(base)}")
+            if body is not None:
+                fields.append(f"body: {_graphql_string(body)}")
+            mutations.append(
+                f"  m{i}: updatePullRequest(input: {{{', '.join(fields)}}}) "
+                "{ clientMutationId }"
+            )
+        await self.graphql("mutation {\n" + "\n".join(mutations) + "\n}")
+
+
+async def _gather_bounded(
+    coros: Iterable[Awaitable[T]], limit: int = GH_MAX_CONCURRENCY
+) -> List[T]:
+    # The semaphore must be created inside the running loop (Python 3.9).
+    sem = asyncio.Semaphore(limit)
+
+    async def bounded(coro: Awaitable[T]) -> T:
+        async with sem:
+            return await coro
+
+    return list(await asyncio.gather(*(bounded(c) for c in coros)))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+from ..shell import iter_lines, run
+from ._types import BranchInfo
+
+
+log = logging.getLogger(__name__)
+
+# Records what was last pushed, inside the repo's .jj directory.
+LAST_PUSH_FILE = ".jj-ext-last-push"
+# Seconds an identical stack is trusted to still be on the remote.
+LAST_PUSH_TTL = 300
+
+# One line per commit in trunk()..@: "<bookmark> <bookmark>... <commit_id>".
+# Bookmark names cannot contain spaces, so the commit id is the last field.
+STACK_LOG_TEMPLATE = (
+    'local_bookmarks.map(|b| b.name()).join(" ") ++ " " ++ commit_id ++ "\\n"'
+)
+
+
+def discover_stack(repo_path: str) -> List[BranchInfo]:
+    """Return the bookmarked commits between trunk and @, bottom first."""
+    lines = iter_lines(
+        # jj log -r 'trunk()..@' -T '<STACK_LOG_TEMPLATE>' --no-graph
+        ["jj", "log", "-r", "trunk()..@", "-T", STACK_LOG_TEMPLATE, "--no-graph"],
+        cwd=repo_path,
+    )
+    branches: List[BranchInfo] = []
+    seen = set()
+    for line in lines:
+        names, _, commit_id = line.rpartition(" ")
+        # If there are multiple bookmarks on one commit, stack the first one
+        name, *others = names.split(" ") if names else [""]
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        branches.append(
+            BranchInfo(name=name, target=commit_id, other_bookmarks=tuple(others))
+        )
+    # jj log lists newest first
+    branches.reverse()
+    return branches
+
+
+def _find_jj_dir(repo_path: str) -> Optional[str]:
+    path = os.path.realpath(repo_path)
+    while True:
+        candidate = os.path.join(path, ".jj")
+        if os.path.isdir(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _read_last_push(marker_file: str) -> Optional[str]:
+    try:
+        if time.time() - os.path.getmtime(marker_file) > LAST_PUSH_TTL:
+            return None
+        with open(marker_file) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_last_push(marker_file: str, fingerprint: str) -> None:
+    try:
+        tmp = f"{marker_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(fingerprint)
+        os.replace(tmp, marker_file)
+    except OSError:
+        pass  # only costs a redundant push next time
+
+
+def push_stack(repo_path: str, stack: List[BranchInfo]) -> None:
+    """Push trunk()..@ unless this exact stack was pushed moments ago."""
+    args = ["jj", "git", "push", "-r", "trunk()..@", "--allow-new"]
+    jj_dir = _find_jj_dir(repo_path)
+    if jj_dir is None:
+        run(args, cwd=repo_path, check=True)
+        return
+    # Every bookmark in the range is pushed, so all of them go in.
+    fingerprint = "\n".join(
+        " ".join((branch.target, branch.name, *branch.other_bookmarks))
+        for branch in stack
+    )
+    marker_file = os.path.join(jj_dir, LAST_PUSH_FILE)
+    try:
+        lock = open(marker_file + ".lock", "w")
+    except OSError:
+        # e.g. a read-only .jj; just push without the skip check
+        run(args, cwd=repo_path, check=True)
+        return
+    with lock:
+        # Serialize concurrent syncs so they don't race on the push or marker.
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        if _read_last_push(marker_file) == fingerprint:
+            log.debug("Stack unchanged since last push, skipping jj git push")
+            return
+        # jj git push -r 'trunk()..@' --allow-new
+        run(args, cwd=repo_path, check=True)
+        _write_last_push(marker_file, fingerprint)
+
+
+def _quote_revset_string(s: str) -> str:
+    escaped = s.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+
+STACK_SECTION_TEMPLATE = "<!-- {key}:start -->\n{lines}\n<!-- {key}:end -->"
+
+_MARKER_RE_CACHE: Dict[str, "re.Pattern[str]"] = {}
+
+
+def render_stack_sections(marker_key: str, pr_numbers_in_order: List[int]) -> List[str]:
+    """Render the managed section for every position in the stack.
+
+    The plain lines are built once; only the pointer line is swapped in and
+    out per position.
+    """
+    lines = [f"- #{num}" for num in pr_numbers_in_order]
+    sections: List[str] = []
+    for idx, num in enumerate(pr_numbers_in_order):
+        plain = lines[idx]
+        lines[idx] = f"- 👉 #{num}"
+        sections.append(
+            STACK_SECTION_TEMPLATE.format(key=marker_key, lines="\n".join(lines))
+        )
+        lines[idx] = plain
+    return sections
+
+
+def _marker_pattern(marker_key: str) -> "re.Pattern[str]":
+    pat = _MARKER_RE_CACHE.get(marker_key)
+    if pat is None:
+        key = re.escape(marker_key)
+        pat = re.compile(rf"(?s)[ \t]*<!-- {key}:start -->.*?<!-- {key}:end -->")
+        _MARKER_RE_CACHE[marker_key] = pat
+    return pat
+
+
+def upsert_marker_section(existing_body: str, marker_key: str, new_section: str) -> str:
+    # A callable replacement keeps backslashes in the section literal.
+    new_body, n = _marker_pattern(marker_key).subn(
+        lambda _: new_section, existing_body, count=1
+    )
+    if n:
+        return new_body
+    rest = existing_body.strip()
+    return new_section + ("\n\n" + rest if rest else "")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+# slots=True needs Python 3.10+; fall back to plain frozen dataclasses.
+_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTS)
+class BranchInfo:
+    name: str
+    target: str  # commit id
+    # Further local bookmarks on the same commit; pushed, but not stacked.
+    other_bookmarks: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTS)
+class PullRequest:
+    number: int
+    head: str
+    base: str
+    body: str
+    id: str = ""  # GraphQL node id
+
+
+# (PR node id, new base or None, new body or None)
+PullRequestUpdate = Tuple[str, Optional[str], Optional[str]]